@@ -1,14 +1,28 @@
 import os
+import base64
+import hashlib
 import mimetypes
+import posixpath
 import requests
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from datetime import datetime, UTC
-from typing import List, Dict, Any, Optional
-
-from flask import Flask, request, jsonify, render_template, abort, redirect, url_for, flash
-from github import Github, GithubException, ContentFile
+from typing import List, Dict, Any, Optional, Tuple, Union
+from urllib.parse import quote, unquote
+
+import orjson
+from cachetools import TTLCache
+from flask import Flask, request, jsonify, render_template, make_response, abort, redirect, url_for, flash
+from flask.json.provider import JSONProvider
+from github import Github, GithubException, GithubRetry, ContentFile, GitCommit, GitRef, GitTree, InputGitTreeElement
+from requests.adapters import HTTPAdapter
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
+from jinja2 import FileSystemBytecodeCache
 
 # Load environment variables from .env if present
 load_dotenv()
@@ -26,79 +40,366 @@ class Config:
         if not (cls.GIT_TOKEN and cls.GIT_REPO):
             raise RuntimeError("Set GIT_TOKEN and GIT_REPO env vars before running.")
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # Hand orjson's bytes straight to the response, skipping str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
 # --- Initialization ---
 Config.validate()
-g = Github(Config.GIT_TOKEN)
+g = Github(
+    Config.GIT_TOKEN,
+    per_page=100,
+    retry=GithubRetry(total=3, backoff_factor=0.2),
+    pool_size=20,
+)
 repo = g.get_repo(Config.GIT_REPO)
 
+# Shared keep-alive pool for fetching remote URLs on upload
+http = requests.Session()
+http.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
+http.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
+
 app = Flask(__name__)
 app.secret_key = Config.SECRET_KEY
+app.json = OrjsonProvider(app)
 app.config['MAX_CONTENT_LENGTH'] = Config.MAX_FILE_SIZE
 
+# (path, ref) -> (etag, raw JSON, fetched at) of the last Contents API response.
+# Served as-is while fresh, then revalidated with If-None-Match; 304s don't
+# count against the rate limit.
+_contents_cache = TTLCache(maxsize=1024, ttl=300)
+CONTENTS_FRESH_SECONDS = 30
+_contents_lock = threading.Lock()
+
+# storage folder path -> listing built by list_repo_contents()
+_listing_cache = TTLCache(maxsize=256, ttl=30)
+_listing_lock = threading.Lock()
+
+# storage folder path -> (listing, its orjson bytes); valid while the listing is
+_listing_json_cache = TTLCache(maxsize=256, ttl=30)
+
+# Names secure_filename() would return unchanged
+_SAFE_FILENAME_RE = re.compile(r"[A-Za-z0-9-](?:[A-Za-z0-9_.-]*[A-Za-z0-9-])?")
+
+# filename= / RFC 5987 filename*= parameters of a Content-Disposition header
+# Any RFC 5987 charset token is matched so it never leaks into the name;
+# only the charsets we can decode are honoured
+_CD_FILENAME_RE = re.compile(r"""filename(\*)?=(?:([\w!#$&+.^`{}~-]+)'[^']*')?"?([^";]+)"?""", re.IGNORECASE)
+_CD_CHARSETS = ("utf-8", "iso-8859-1")
+
+# The Contents API returns at most this many entries per directory
+CONTENTS_LIST_LIMIT = 1000
+
+# Concurrent blob uploads per batch commit; kept low for GitHub's secondary rate limits
+BLOB_UPLOAD_WORKERS = 8
+
+# Every direct download URL starts with this
+_RAW_PREFIX = f"https://raw.githubusercontent.com/{Config.GIT_REPO}/{Config.GITHUB_BRANCH}/"
+
+# Extension -> MIME type, snapshotted once from the system mimetypes DB,
+# with the suffix/encoding tables guess_type() applies before the lookup
+mimetypes.init()
+_MIME_TYPES = dict(mimetypes.types_map)
+_MIME_SUFFIXES = dict(mimetypes.suffix_map)
+_MIME_ENCODINGS = dict(mimetypes.encodings_map)
+
 # --- Helpers ---
 
+def _strip_file_content(data: Any) -> Any:
+    """Drop the base64 body from file entries; only metadata is cached."""
+    if isinstance(data, dict) and data.get("type") == "file" and "content" in data:
+        data = {k: v for k, v in data.items() if k not in ("content", "encoding")}
+    return data
+
+def get_contents_json(path: str, revalidate: bool = False) -> Any:
+    """Raw Contents API JSON for a path, backed by a TTL + ETag cache.
+
+    revalidate=True skips the fresh window and always asks GitHub
+    (If-None-Match), for writers that need a current sha.
+    """
+    key = (path, Config.GITHUB_BRANCH)
+    with _contents_lock:
+        cached = _contents_cache.get(key)
+
+    if cached and not revalidate and time.monotonic() - cached[2] < CONTENTS_FRESH_SECONDS:
+        return cached[1]
+
+    headers = {"If-None-Match": cached[0]} if cached else None
+    resp_headers, data = repo.requester.requestJsonAndCheck(
+        "GET",
+        f"{repo.url}/contents/{quote(path)}",
+        parameters={"ref": Config.GITHUB_BRANCH},
+        headers=headers,
+        follow_302_redirect=True,
+    )
+
+    if data is None and cached:
+        # 304 Not Modified: reuse the stored body
+        data = cached[1]
+        with _contents_lock:
+            _contents_cache[key] = (cached[0], data, time.monotonic())
+    elif resp_headers.get("etag"):
+        # File bodies can be ~1.3 MB of base64 each; keep metadata only
+        data = _strip_file_content(data)
+        with _contents_lock:
+            _contents_cache[key] = (resp_headers["etag"], data, time.monotonic())
+
+    return data
+
+def get_contents(path: str, revalidate: bool = False) -> Union[ContentFile.ContentFile, List[ContentFile.ContentFile]]:
+    """repo.get_contents() on top of get_contents_json()."""
+    data = get_contents_json(path, revalidate=revalidate)
+    if isinstance(data, list):
+        return [
+            ContentFile.ContentFile(repo.requester, {}, item, completed=(item["type"] != "file"))
+            for item in data
+        ]
+    # Not completed: .content/.decoded_content lazily refetch the stripped body
+    return ContentFile.ContentFile(repo.requester, {}, data, completed=False)
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
 def format_bytes(size: int) -> str:
     """Format bytes to human readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024.0:
-            return f"{size:.1f} {unit}"
-        size /= 1024.0
-    return f"{size:.1f} PB"
+    i = min(max(size.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
 
 def get_direct_download_url(file_path: str) -> str:
     """Get direct GitHub raw content URL."""
-    return f"https://raw.githubusercontent.com/{Config.GIT_REPO}/{Config.GITHUB_BRANCH}/{file_path}"
+    return _RAW_PREFIX + quote(file_path)
 
+@lru_cache(maxsize=4096)
 def get_mime_type(filename: str) -> str:
     """Get MIME type for file."""
-    mime_type, _ = mimetypes.guess_type(filename)
-    return mime_type or 'application/octet-stream'
+    # Same resolution as mimetypes.guess_type(): .tgz -> .tar.gz, then an
+    # encoding suffix (.gz, .bz2, ...) is peeled off before the type lookup
+    base, ext = posixpath.splitext(filename)
+    while ext.lower() in _MIME_SUFFIXES:
+        base, ext = posixpath.splitext(base + _MIME_SUFFIXES[ext.lower()])
+    if ext in _MIME_ENCODINGS:
+        base, ext = posixpath.splitext(base)
+    return _MIME_TYPES.get(ext.lower(), 'application/octet-stream')
+
+def fast_secure_filename(filename: str) -> str:
+    """secure_filename() that skips normalization for already-safe names."""
+    if _SAFE_FILENAME_RE.fullmatch(filename):
+        return filename
+    return secure_filename(filename)
+
+def filename_from_disposition(cd: str) -> str:
+    """Filename from a Content-Disposition header, preferring filename*=."""
+    plain = ""
+    for star, charset, value in _CD_FILENAME_RE.findall(cd):
+        if star:
+            charset = charset.lower() or "utf-8"
+            if charset in _CD_CHARSETS:
+                return unquote(value, encoding=charset, errors="replace")
+        else:
+            plain = plain or value
+    return plain
 
 def get_storage_path(filename: str, folder: str = "") -> str:
     """Construct full path for file in storage."""
     folder = folder.strip().strip("/")
-    filename = secure_filename(filename)
+    filename = fast_secure_filename(filename)
     if folder:
         return f"{Config.STORAGE_DIR}/{folder}/{filename}"
     return f"{Config.STORAGE_DIR}/{filename}"
 
+def get_head() -> Tuple[GitRef.GitRef, GitCommit.GitCommit]:
+    """Branch ref and the commit it currently points at."""
+    ref = repo.get_git_ref(f"heads/{Config.GITHUB_BRANCH}")
+    return ref, repo.get_git_commit(ref.object.sha)
+
+def commit_batch(
+    changes: List[Tuple[str, Optional[str]]],
+    message: str,
+    head: Optional[Tuple[GitRef.GitRef, GitCommit.GitCommit]] = None,
+) -> None:
+    """Write several files as one commit via the Git Data API.
+
+    Each change is a (path, base64 content) pair; None deletes the path.
+    Pass head from get_head() to build on a commit the caller already read.
+    """
+    ref, head = head or get_head()
+
+    def to_element(change):
+        path, content = change
+        if content is None:
+            return InputGitTreeElement(path, "100644", "blob", sha=None)
+        blob = repo.create_git_blob(content, "base64")
+        return InputGitTreeElement(path, "100644", "blob", sha=blob.sha)
+
+    # Blob uploads are independent and latency-bound, so send them in parallel
+    uploads = sum(1 for _, content in changes if content is not None)
+    if uploads > 1:
+        with ThreadPoolExecutor(max_workers=min(uploads, BLOB_UPLOAD_WORKERS)) as pool:
+            elements = list(pool.map(to_element, changes))
+    else:
+        elements = [to_element(c) for c in changes]
+
+    tree = repo.create_git_tree(elements, base_tree=head.tree)
+    commit = repo.create_git_commit(message, tree, [head])
+    ref.edit(commit.sha)
+
+def get_tree_recursive(tree_sha: Optional[str] = None) -> GitTree.GitTree:
+    """Fetch every entry of a tree (default: the branch) in one git/trees?recursive=1 call."""
+    return repo.get_git_tree(tree_sha or Config.GITHUB_BRANCH, recursive=True)
+
+def list_tree_children(folder_path: str) -> List[Dict[str, Any]]:
+    """Direct children of a folder, read from the recursive tree.
+
+    Used for folders too large for the Contents API, which truncates.
+    """
+    prefix = folder_path.strip("/") + "/"
+    tree = get_tree_recursive()
+    if tree.truncated:
+        # GitHub caps recursive trees (100k entries / 7 MB); what we have is
+        # still correct, just incomplete
+        app.logger.error(f"Recursive tree truncated; listing of '{folder_path}' is partial")
+    children = []
+    for e in tree.tree:
+        name = e.path[len(prefix):]
+        if e.path.startswith(prefix) and "/" not in name and e.type in ("blob", "tree"):
+            children.append({
+                "name": name,
+                "path": e.path,
+                "type": "file" if e.type == "blob" else "dir",
+                "size": e.size,
+            })
+    return children
+
+def read_upload_b64(file) -> Optional[str]:
+    """Base64-encode an uploaded file, or return None if it exceeds MAX_FILE_SIZE."""
+    # Werkzeug spools the part to a temp file; size it there, then encode
+    # straight from the spool so the raw bytes are never held in full.
+    file.stream.seek(0, os.SEEK_END)
+    if file.stream.tell() > Config.MAX_FILE_SIZE:
+        file.close()
+        return None
+    file.stream.seek(0)
+    # 57 KiB is a multiple of 3, so no chunk but the last gets padding
+    chunks = iter(lambda: file.stream.read(57 * 1024), b"")
+    content = b"".join(base64.b64encode(chunk) for chunk in chunks).decode()
+    file.close()
+    return content
+
+def put_file(path: str, message: str, content: str, sha: Optional[str] = None) -> None:
+    """Contents API create/update with already base64-encoded content."""
+    payload = {"message": message, "content": content, "branch": Config.GITHUB_BRANCH}
+    if sha:
+        payload["sha"] = sha
+    repo.requester.requestJsonAndCheck("PUT", f"{repo.url}/contents/{quote(path)}", input=payload)
+
+def invalidate_path(path: str) -> None:
+    """Drop cached listings and contents affected by a change at the given repo path."""
+    parent = path.rsplit("/", 1)[0]
+
+    def affected(p):
+        return p in (parent, path) or p.startswith(path + "/")
+
+    with _listing_lock:
+        for key in list(_listing_cache):
+            if affected(key):
+                _listing_cache.pop(key, None)
+    with _contents_lock:
+        for key in list(_contents_cache):
+            if affected(key[0]):
+                _contents_cache.pop(key, None)
+
 def list_repo_contents(folder: str = "") -> List[Dict[str, Any]]:
     """List all files and folders in given directory from GitHub."""
     folder_path = f"{Config.STORAGE_DIR}/{folder}".strip("/")
+    with _listing_lock:
+        cached = _listing_cache.get(folder_path)
+    if cached is not None:
+        return cached
     
     try:
-        contents = repo.get_contents(folder_path, ref=Config.GITHUB_BRANCH)
+        # Work on the raw JSON: no ContentFile objects, and .gitkeep
+        # placeholders are dropped before anything is built for them
+        contents = get_contents_json(folder_path)
         if not isinstance(contents, list):
             contents = [contents]
+        elif len(contents) >= CONTENTS_LIST_LIMIT:
+            contents = list_tree_children(folder_path)
         
-        items = []
-        for c in contents:
-            if c.name == ".gitkeep":
-                continue
-            
-            item = {
-                "name": c.name,
-                "path": c.path,
-                "is_dir": c.type == "dir",
-            }
+        keyed = []
+        append = keyed.append
+        for c in [c for c in contents if c["name"] != ".gitkeep"]:
+            name = c["name"]
+            kind = c["type"]
+            is_dir = kind == "dir"
+            item = {"name": name, "path": c["path"], "is_dir": is_dir}
             
-            if c.type == "file":
-                item.update({
-                    "size": c.size,
-                    "size_formatted": format_bytes(c.size),
-                    "download_url": get_direct_download_url(c.path),
-                    "mime_type": get_mime_type(c.name),
-                })
+            # Derived fields (size_formatted, download_url, mime_type) are
+            # added only where needed: per rendered row in the template, and
+            # once per cached listing in list_repo_contents_json()
+            if not is_dir:
+                item["size"] = c.get("size") or 0
             
-            items.append(item)
+            append(((not is_dir, name.lower()), item))
         
         # Sort: directories first, then files
-        items.sort(key=lambda x: (not x["is_dir"], x["name"].lower()))
+        keyed.sort(key=itemgetter(0))
+        items = [item for _, item in keyed]
+        with _listing_lock:
+            _listing_cache[folder_path] = items
         return items
     except GithubException as e:
         app.logger.error(f"GitHub error listing contents of '{folder_path}': {e}")
         return []
 
+def conditional(response):
+    """Tag a response with a hash of its body and answer If-None-Match with 304."""
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+    return response.make_conditional(request)
+
+def list_repo_contents_json(folder: str = "") -> bytes:
+    """list_repo_contents() serialized, reusing the bytes while the listing is cached."""
+    folder_path = f"{Config.STORAGE_DIR}/{folder}".strip("/")
+    files = list_repo_contents(folder)
+    with _listing_lock:
+        cached = _listing_json_cache.get(folder_path)
+    if cached and cached[0] is files:
+        return cached[1]
+
+    body = orjson.dumps([
+        f if f["is_dir"] else dict(
+            f,
+            size_formatted=format_bytes(f["size"]),
+            download_url=get_direct_download_url(f["path"]),
+            mime_type=get_mime_type(f["name"]),
+        )
+        for f in files
+    ])
+    with _listing_lock:
+        _listing_json_cache[folder_path] = (files, body)
+    return body
+
+app.add_template_filter(format_bytes)
+app.add_template_global(get_direct_download_url, "download_url")
+
+if not app.debug:
+    # Reuse compiled templates across cold starts and skip mtime checks;
+    # app.run(debug=True) turns auto_reload back on for development.
+    # The default directory is per-user (0700, ownership checked), so other
+    # local users cannot plant bytecode for us to load
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+    app.jinja_env.auto_reload = False
+    for name in ("index.html", "error.html"):
+        app.jinja_env.get_template(name)
+
 # --- Routes ---
 
 @app.route("/", defaults={"folder": ""})
@@ -114,18 +415,15 @@ def index(folder: str):
 
     files = list_repo_contents(folder)
     
-    # Calculate parent folder path
-    parent = None
-    if folder:
-        parts = folder.strip("/").split("/")
-        parent = "/".join(parts[:-1]) if len(parts) > 1 else ""
+    # Calculate parent folder path ("" for top-level folders)
+    parent = posixpath.dirname(folder.strip("/")) if folder else None
     
-    return render_template(
+    return conditional(make_response(render_template(
         "index.html",
         files=files,
         current_folder=folder,
         parent_folder=parent
-    )
+    )))
 
 @app.route("/auth/vault", methods=["POST"])
 def auth_vault():
@@ -144,77 +442,109 @@ def auth_vault():
 
 @app.route("/upload", methods=["POST"])
 def upload():
-    """Handle file upload from local file or URL."""
+    """Handle file upload from local file(s) or URL."""
     folder = request.form.get("folder", "").strip("/")
     url = request.form.get("url", "").strip()
-    file = request.files.get("file")
-    data = None
+    files = [f for f in request.files.getlist("file") if f.filename]
+    content = None
     filename = None
 
     # Option 1: Download from URL
     if url:
         try:
-            with requests.get(url, timeout=30, stream=True) as r:
+            with http.get(url, timeout=(5, 30), stream=True) as r:
                 r.raise_for_status()
-                content_length = r.headers.get('content-length')
-                if content_length and int(content_length) > Config.MAX_FILE_SIZE:
+                # Fast path: trust a well-formed Content-Length; the cap below
+                # still applies if it is missing or wrong
+                content_length = r.headers.get('content-length', '')
+                if content_length.isdigit() and int(content_length) > Config.MAX_FILE_SIZE:
                     flash(f"File too large. Max size: {format_bytes(Config.MAX_FILE_SIZE)}")
                     return redirect(url_for("index", folder=folder))
                 
-                data = r.content
+                buf = bytearray()
+                for chunk in r.iter_content(64 * 1024):
+                    buf.extend(chunk)
+                    if len(buf) > Config.MAX_FILE_SIZE:
+                        flash(f"File too large. Max size: {format_bytes(Config.MAX_FILE_SIZE)}")
+                        return redirect(url_for("index", folder=folder))
+                content = base64.b64encode(buf).decode()
+                del buf  # don't hold the raw bytes through the GitHub call
                 
                 # Get filename from Content-Disposition or URL
                 cd = r.headers.get('content-disposition')
                 if cd:
-                    fname_match = re.findall('filename=(.+)', cd)
-                    if fname_match:
-                        filename = secure_filename(fname_match[0].strip('"'))
+                    filename = fast_secure_filename(filename_from_disposition(cd))
                 
                 if not filename:
-                    filename = secure_filename(url.split("/")[-1].split("?")[0]) or "downloaded_file"
+                    filename = fast_secure_filename(url.split("/")[-1].split("?")[0]) or "downloaded_file"
                     
         except requests.RequestException as e:
             flash(f"Failed to download from URL: {str(e)}")
             return redirect(url_for("index", folder=folder))
     
-    # Option 2: Upload from local file
-    elif file and file.filename:
-        data = file.read()
-        filename = secure_filename(file.filename)
+    # Option 2: Several local files, committed together
+    elif len(files) > 1:
+        changes = []
+        for f in files:
+            content = read_upload_b64(f)
+            if content is None:
+                flash(f"File too large. Max size: {format_bytes(Config.MAX_FILE_SIZE)}")
+                return redirect(url_for("index", folder=folder))
+            changes.append((get_storage_path(f.filename, folder), content))
+
+        commit_message = f"Upload {len(changes)} files @ {datetime.now(UTC).isoformat()}"
+        try:
+            commit_batch(changes, commit_message)
+            flash(f"{len(changes)} files uploaded successfully.")
+        except GithubException as e:
+            app.logger.error(f"GitHub batch upload error: {e}")
+            flash(f"GitHub error: {e.data.get('message', str(e))}")
+
+        for path, _ in changes:
+            invalidate_path(path)
+        return redirect(url_for("index", folder=folder))
+
+    # Option 3: Upload from local file
+    elif files:
+        content = read_upload_b64(files[0])
+        if content is None:
+            flash(f"File too large. Max size: {format_bytes(Config.MAX_FILE_SIZE)}")
+            return redirect(url_for("index", folder=folder))
+        filename = fast_secure_filename(files[0].filename)
     
     else:
         flash("No file or URL provided.")
         return redirect(url_for("index", folder=folder))
 
-    # Final size validation
-    if len(data) > Config.MAX_FILE_SIZE:
-        flash(f"File too large. Max size: {format_bytes(Config.MAX_FILE_SIZE)}")
-        return redirect(url_for("index", folder=folder))
-
     # Commit to GitHub
     path = get_storage_path(filename, folder)
     timestamp = datetime.now(UTC).isoformat()
     commit_message = f"Upload {filename} @ {timestamp}"
     
     try:
+        # Optimistically create; GitHub answers 422 "sha wasn't supplied"
+        # only when the file already exists, so new uploads skip the lookup
         try:
-            existing = repo.get_contents(path, ref=Config.GITHUB_BRANCH)
-            repo.update_file(path, commit_message, data, existing.sha, branch=Config.GITHUB_BRANCH)
-            flash(f"File '{filename}' updated successfully.")
-        except GithubException:
-            repo.create_file(path, commit_message, data, branch=Config.GITHUB_BRANCH)
+            put_file(path, commit_message, content)
             flash(f"File '{filename}' uploaded successfully.")
+        except GithubException as e:
+            if e.status != 422 or "sha" not in str(e.data.get('message', '')):
+                raise
+            existing = get_contents(path, revalidate=True)
+            put_file(path, commit_message, content, sha=existing.sha)
+            flash(f"File '{filename}' updated successfully.")
     except GithubException as e:
         app.logger.error(f"GitHub upload error: {e}")
         flash(f"GitHub error: {e.data.get('message', str(e))}")
 
+    invalidate_path(path)
     return redirect(url_for("index", folder=folder))
 
 @app.route("/create_folder", methods=["POST"])
 def create_folder():
     """Create a new folder by placing a .gitkeep file."""
     folder = request.form.get("folder", "").strip("/")
-    new_folder_name = secure_filename(request.form.get("new_folder_name", "").strip())
+    new_folder_name = fast_secure_filename(request.form.get("new_folder_name", "").strip())
     
     if not new_folder_name:
         flash("Folder name is required.")
@@ -225,6 +555,7 @@ def create_folder():
     
     try:
         repo.create_file(new_folder_path, commit_message, b"", branch=Config.GITHUB_BRANCH)
+        invalidate_path(new_folder_path.rsplit("/", 1)[0])
         flash(f"Folder '{new_folder_name}' created successfully.")
     except GithubException as e:
         app.logger.error(f"GitHub create folder error: {e}")
@@ -238,11 +569,11 @@ def create_folder():
 def api_get_file_info(file_path: str):
     """API endpoint to get file info."""
     try:
-        c = repo.get_contents(file_path, ref=Config.GITHUB_BRANCH)
+        c = get_contents(file_path)
         if isinstance(c, list):
             return jsonify({"error": "Path is a directory"}), 400
             
-        return jsonify({
+        response = jsonify({
             "name": c.name,
             "path": c.path,
             "size": c.size,
@@ -251,6 +582,9 @@ def api_get_file_info(file_path: str):
             "mime_type": get_mime_type(c.name),
             "sha": c.sha
         })
+        # The blob sha changes exactly when the file does
+        response.set_etag(c.sha)
+        return response.make_conditional(request)
     except GithubException as e:
         return jsonify({"error": e.data.get('message', str(e))}), 404
 
@@ -258,36 +592,32 @@ def api_get_file_info(file_path: str):
 def api_delete_file(file_path: str):
     """API endpoint to delete a file."""
     try:
-        c = repo.get_contents(file_path, ref=Config.GITHUB_BRANCH)
+        c = get_contents(file_path, revalidate=True)
         if isinstance(c, list):
             return jsonify({"error": "Use folder delete endpoint for directories"}), 400
             
         commit_message = f"Delete {file_path} @ {datetime.now(UTC).isoformat()}"
         repo.delete_file(file_path, commit_message, c.sha, branch=Config.GITHUB_BRANCH)
+        invalidate_path(file_path)
         return jsonify({"message": f"File '{file_path}' deleted successfully"})
     except GithubException as e:
         return jsonify({"error": e.data.get('message', str(e))}), 404
 
 @app.route("/api/folders/<path:folder_path>", methods=["DELETE"])
 def api_delete_folder(folder_path: str):
-    """API endpoint to recursively delete a folder."""
-    def recursive_delete(path):
-        try:
-            contents = repo.get_contents(path, ref=Config.GITHUB_BRANCH)
-            if not isinstance(contents, list):
-                contents = [contents]
-            
-            for item in contents:
-                if item.type == "dir":
-                    recursive_delete(item.path)
-                else:
-                    msg = f"Delete {item.path} @ {datetime.now(UTC).isoformat()}"
-                    repo.delete_file(item.path, msg, item.sha, branch=Config.GITHUB_BRANCH)
-        except GithubException:
-            pass
-    
+    """API endpoint to recursively delete a folder in a single commit."""
+    prefix = folder_path.strip("/") + "/"
     try:
-        recursive_delete(folder_path)
+        # List and commit against the same head so the delete is consistent
+        head = get_head()
+        tree = get_tree_recursive(head[1].tree.sha)
+        if tree.truncated:
+            return jsonify({"error": "Repository tree is too large to delete from in one commit"}), 500
+
+        changes = [(e.path, None) for e in tree.tree if e.type == "blob" and e.path.startswith(prefix)]
+        if changes:
+            commit_batch(changes, f"Delete {folder_path} @ {datetime.now(UTC).isoformat()}", head=head)
+        invalidate_path(folder_path.strip("/"))
         return jsonify({"message": f"Folder '{folder_path}' deleted successfully"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -295,8 +625,8 @@ def api_delete_folder(folder_path: str):
 @app.route("/api/folders/<path:folder_path>", methods=["GET"])
 def api_list_folder(folder_path: str):
     """API endpoint to list folder contents."""
-    files = list_repo_contents(folder_path)
-    return jsonify({"folder": folder_path, "files": files})
+    body = b'{"folder":' + orjson.dumps(folder_path) + b',"files":' + list_repo_contents_json(folder_path) + b"}"
+    return conditional(app.response_class(body, mimetype="application/json"))
 
 # --- Error Handlers ---
 
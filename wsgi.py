@@ -0,0 +1,7 @@
+"""Production entry point: gunicorn -k gevent wsgi:app"""
+from gevent import monkey
+
+# Patch sockets/ssl before requests and PyGithub get imported
+monkey.patch_all()
+
+from app import app  # noqa: E402